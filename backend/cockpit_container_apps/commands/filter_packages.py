@@ -7,12 +7,12 @@ Filters packages with cascade filtering: store → repository → category → t
 from typing import Any
 
 from cockpit_container_apps.utils.formatters import format_package
-from cockpit_container_apps.utils.store_config import load_stores
+from cockpit_container_apps.utils.store_config import load_stores_by_id
 from cockpit_container_apps.utils.store_filter import (
     get_pre_filtered_packages,
     matches_store_filter,
 )
-from cockpit_container_apps.vendor.cockpit_apt_utils.debtag_parser import get_tags_by_facet
+from cockpit_container_apps.utils.tag_cache import get_tags_by_facet
 from cockpit_container_apps.vendor.cockpit_apt_utils.errors import CacheError
 from cockpit_container_apps.vendor.cockpit_apt_utils.repository_parser import (
     package_matches_repository,
@@ -67,8 +67,7 @@ def execute(
     # Load store config if filtering by store
     store = None
     if store_id:
-        stores = load_stores()
-        store = next((s for s in stores if s.id == store_id), None)
+        store = load_stores_by_id().get(store_id)
         if not store:
             raise CacheError(
                 f"Store not found: {store_id}",
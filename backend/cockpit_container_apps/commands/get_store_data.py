@@ -6,19 +6,18 @@ response to reduce API roundtrips. This replaces separate calls to list-stores,
 list-categories, and filter-packages.
 """
 
+from collections import Counter
 from pathlib import Path
 from typing import Any
 
 from cockpit_container_apps.utils.formatters import format_package
-from cockpit_container_apps.utils.store_config import load_stores
+from cockpit_container_apps.utils.store_config import load_stores_by_id
 from cockpit_container_apps.utils.store_filter import (
     get_pre_filtered_packages,
     matches_store_filter,
 )
-from cockpit_container_apps.vendor.cockpit_apt_utils.debtag_parser import (
-    derive_category_label,
-    get_tags_by_facet,
-)
+from cockpit_container_apps.utils.tag_cache import get_tags_by_facet
+from cockpit_container_apps.vendor.cockpit_apt_utils.debtag_parser import derive_category_label
 from cockpit_container_apps.vendor.cockpit_apt_utils.errors import APTBridgeError, CacheError
 
 APT_LISTS_DIR = Path("/var/lib/apt/lists")
@@ -75,30 +74,25 @@ def execute(store_id: str) -> dict[str, Any]:
 
     try:
         # Load store configuration
-        stores = load_stores()
-        matching_stores = [s for s in stores if s.id == store_id]
+        store_config = load_stores_by_id().get(store_id)
 
-        if not matching_stores:
+        if store_config is None:
             raise APTBridgeError(
                 f"Store '{store_id}' not found",
                 "STORE_NOT_FOUND",
             )
 
-        store_config = matching_stores[0]
-
-        # Build metadata lookup map for categories
-        category_metadata_map = {}
-        if store_config.category_metadata:
-            category_metadata_map = {meta.id: meta for meta in store_config.category_metadata}
+        # Metadata lookup map for categories
+        category_metadata_map = store_config.category_metadata_by_id
 
         # Use origin pre-filtering for performance
         packages_to_check = get_pre_filtered_packages(cache, store_config)
 
         # Collect packages and category counts in single pass
         packages = []
-        category_counts_all: dict[str, int] = {}
-        category_counts_available: dict[str, int] = {}
-        category_counts_installed: dict[str, int] = {}
+        category_counts_all: Counter[str] = Counter()
+        category_counts_available: Counter[str] = Counter()
+        category_counts_installed: Counter[str] = Counter()
 
         for pkg in packages_to_check:
             # Apply store filter
@@ -115,42 +109,25 @@ def execute(store_id: str) -> dict[str, Any]:
             # Extract category tags for counting
             categories = get_tags_by_facet(pkg, "category")
 
-            # Count for all packages
-            for category_id in categories:
-                category_counts_all[category_id] = category_counts_all.get(category_id, 0) + 1
-
-            # Count for available (not installed) packages
-            if not pkg.is_installed:
-                for category_id in categories:
-                    category_counts_available[category_id] = (
-                        category_counts_available.get(category_id, 0) + 1
-                    )
-
-            # Count for installed packages
+            # Count for all packages, and for either installed or available
+            category_counts_all.update(categories)
             if pkg.is_installed:
-                for category_id in categories:
-                    category_counts_installed[category_id] = (
-                        category_counts_installed.get(category_id, 0) + 1
-                    )
+                category_counts_installed.update(categories)
+            else:
+                category_counts_available.update(categories)
 
         # Build category list with metadata
         categories_list = []
 
-        # Get all unique category IDs
-        all_category_ids = (
-            set(category_counts_all.keys())
-            | set(category_counts_available.keys())
-            | set(category_counts_installed.keys())
-        )
-
-        for category_id in all_category_ids:
+        # Every counted category appears in the "all" counter, since installed
+        # and available are disjoint subsets of it
+        for category_id, count_all in category_counts_all.items():
             # Check if we have metadata for this category
             metadata = category_metadata_map.get(category_id)
 
             # Get counts for all three states
-            count_all = category_counts_all.get(category_id, 0)
-            count_available = category_counts_available.get(category_id, 0)
-            count_installed = category_counts_installed.get(category_id, 0)
+            count_available = category_counts_available[category_id]
+            count_installed = category_counts_installed[category_id]
 
             if metadata:
                 # Use metadata from store config
@@ -7,12 +7,12 @@ Lists all packages in a specific category (auto-discovered from category:: tags)
 from typing import Any
 
 from cockpit_container_apps.utils.formatters import format_package
-from cockpit_container_apps.utils.store_config import load_stores
+from cockpit_container_apps.utils.store_config import load_stores_by_id
 from cockpit_container_apps.utils.store_filter import (
     get_pre_filtered_packages,
     matches_store_filter,
 )
-from cockpit_container_apps.vendor.cockpit_apt_utils.debtag_parser import has_tag_facet
+from cockpit_container_apps.utils.tag_cache import has_tag
 from cockpit_container_apps.vendor.cockpit_apt_utils.errors import APTBridgeError, CacheError
 
 
@@ -53,17 +53,14 @@ def execute(category_id: str, store_id: str | None = None) -> list[dict[str, Any
         store_config = None
 
         if store_id:
-            stores = load_stores()
-            matching_stores = [s for s in stores if s.id == store_id]
+            store_config = load_stores_by_id().get(store_id)
 
-            if not matching_stores:
+            if store_config is None:
                 raise APTBridgeError(
                     f"Store '{store_id}' not found",
                     "STORE_NOT_FOUND",
                 )
 
-            store_config = matching_stores[0]
-
         packages = []
 
         # Optimization: Use pre-filtered packages if store is specified
@@ -79,7 +76,7 @@ def execute(category_id: str, store_id: str | None = None) -> list[dict[str, Any
             if not pkg.candidate:
                 continue
 
-            if has_tag_facet(pkg, "category", category_id):
+            if has_tag(pkg, f"category::{category_id}"):
                 packages.append(format_package(pkg))
 
         packages.sort(key=lambda p: p["name"])
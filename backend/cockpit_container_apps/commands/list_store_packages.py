@@ -8,16 +8,26 @@ by querying APT for packages with the role::container-store tag.
 from __future__ import annotations
 
 import logging
+import operator
+import shutil
+import subprocess
+from collections.abc import Iterable
 from typing import Any
 
 import apt
 
-from cockpit_container_apps.vendor.cockpit_apt_utils.debtag_parser import has_tag
+from cockpit_container_apps.utils.tag_cache import has_tag
 
 logger = logging.getLogger(__name__)
 
 STORE_PACKAGE_TAG = "role::container-store"
 
+# dctrl-tools commands that search the available and installed package indexes
+TAG_INDEX_TOOLS = ("grep-aptavail", "grep-status")
+
+# Timeout for a single dctrl-tools query
+TAG_INDEX_TIMEOUT_SECONDS = 30
+
 
 def execute() -> dict[str, Any]:
     """
@@ -37,20 +47,74 @@ def execute() -> dict[str, Any]:
     """
     cache = apt.Cache()
 
-    store_packages: list[dict[str, Any]] = []
+    # Optimization: look up tagged packages in the package indexes instead of
+    # iterating the whole cache. Falls back to a full scan without dctrl-tools.
+    packages_to_check: Iterable[apt.Package]
+    tagged_names = _package_names_with_tag(STORE_PACKAGE_TAG)
+    if tagged_names is None:
+        packages_to_check = cache
+    else:
+        packages_to_check = [cache[name] for name in tagged_names if name in cache]
 
-    for package in cache:
-        if has_tag(package, STORE_PACKAGE_TAG):
-            store_packages.append(_package_to_dict(package))
+    # Index matches are substring matches, so the exact tag is still checked
+    matches = [package for package in packages_to_check if has_tag(package, STORE_PACKAGE_TAG)]
 
-    # Sort by package name for consistent ordering
-    store_packages.sort(key=lambda p: p["package_name"])
+    # Sort by package name for consistent ordering, then serialize only the matches
+    matches.sort(key=operator.attrgetter("name"))
+    store_packages = [_package_to_dict(package) for package in matches]
 
     logger.info("Found %d store package(s)", len(store_packages))
 
     return {"store_packages": store_packages}
 
 
+def _package_names_with_tag(tag: str) -> set[str] | None:
+    """Find names of packages whose Tag field mentions the given tag.
+
+    Queries the available and installed package indexes with dctrl-tools,
+    which is much faster than iterating every package in apt.Cache.
+
+    Args:
+        tag: Debtag to search for (e.g., "role::container-store")
+
+    Returns:
+        Set of candidate package names, or None if dctrl-tools is not
+        installed or a query fails
+    """
+    names: set[str] = set()
+
+    for tool in TAG_INDEX_TOOLS:
+        tool_path = shutil.which(tool)
+        if tool_path is None:
+            logger.debug("%s not found, falling back to full cache scan", tool)
+            return None
+
+        try:
+            result = subprocess.run(
+                [tool_path, "-n", "-s", "Package", "-F", "Tag", tag],
+                capture_output=True,
+                text=True,
+                timeout=TAG_INDEX_TIMEOUT_SECONDS,
+                check=False,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug("%s failed, falling back to full cache scan: %s", tool, e)
+            return None
+
+        # grep-dctrl exits with 1 when nothing matched
+        if result.returncode not in (0, 1):
+            logger.debug(
+                "%s exited with %d, falling back to full cache scan",
+                tool,
+                result.returncode,
+            )
+            return None
+
+        names.update(result.stdout.split())
+
+    return names
+
+
 def _package_to_dict(package: apt.Package) -> dict[str, Any]:
     """Convert an APT package to a dictionary for JSON serialization.
 
@@ -64,12 +128,16 @@ def _package_to_dict(package: apt.Package) -> dict[str, Any]:
     version = None
     description = ""
 
-    if package.candidate:
-        version = package.candidate.version
-        description = package.candidate.summary or ""
-    elif package.installed:
-        version = package.installed.version
-        description = package.installed.summary or ""
+    # Each attribute access goes through python-apt, so look them up once
+    candidate = package.candidate
+    if candidate:
+        version = candidate.version
+        description = candidate.summary or ""
+    else:
+        installed = package.installed
+        if installed:
+            version = installed.version
+            description = installed.summary or ""
 
     # Derive store_id from package name
     # Convention: {store_id}-container-store
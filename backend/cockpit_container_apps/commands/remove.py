@@ -5,12 +5,13 @@ Removes a package using apt-get with progress reporting via Status-Fd.
 Progress is output as JSON lines to stdout for streaming to frontend.
 """
 
-import json
 import os
 import select
 import subprocess
 from typing import Any
 
+from cockpit_container_apps.utils.apt_env import APT_ENV
+from cockpit_container_apps.utils.formatters import write_json_line
 from cockpit_container_apps.vendor.cockpit_apt_utils.errors import (
     APTBridgeError,
     PackageNotFoundError,
@@ -69,7 +70,7 @@ def execute(package_name: str) -> dict[str, Any] | None:
             stderr=subprocess.PIPE,
             pass_fds=(status_write,),
             text=True,
-            env={**os.environ, "DEBIAN_FRONTEND": "noninteractive"},
+            env=APT_ENV,
         )
 
         os.close(status_write)
@@ -98,7 +99,7 @@ def execute(package_name: str) -> dict[str, Any] | None:
                                     "percentage": progress_info["percentage"],
                                     "message": progress_info["message"],
                                 }
-                                print(json.dumps(progress_json), flush=True)
+                                write_json_line(progress_json)
 
         _, stderr = process.communicate()
         status_file.close()
@@ -116,14 +117,14 @@ def execute(package_name: str) -> dict[str, Any] | None:
                 )
 
         final_progress = {"type": "progress", "percentage": 100, "message": "Removal complete"}
-        print(json.dumps(final_progress), flush=True)
+        write_json_line(final_progress)
 
         final_result = {
             "success": True,
             "message": f"Successfully removed {package_name}",
             "package_name": package_name,
         }
-        print(json.dumps(final_result), flush=True)
+        write_json_line(final_result)
 
         return None
 
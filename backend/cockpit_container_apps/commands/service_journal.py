@@ -5,10 +5,10 @@ Streams systemd journal entries for a container app's service unit.
 Output is JSON lines to stdout for streaming to frontend.
 """
 
-import json
 import re
 import subprocess
 
+from cockpit_container_apps.utils.formatters import write_json_line
 from cockpit_container_apps.vendor.cockpit_apt_utils.errors import APTBridgeError
 from cockpit_container_apps.vendor.cockpit_apt_utils.validators import validate_package_name
 
@@ -17,6 +17,9 @@ from cockpit_container_apps.vendor.cockpit_apt_utils.validators import validate_
 # Also strip carriage returns from docker compose TTY output.
 _NONVISUAL_CSI_RE = re.compile(r"\x1b\[[\d;]*[A-HJKSTf]|\r")
 
+# Line endings a text-mode pipe would split on (universal newlines)
+_LINE_BREAK_RE = re.compile(r"\r\n|\r|\n")
+
 # Number of recent journal lines to show before following new output
 DEFAULT_LINES = 50
 
@@ -56,11 +59,12 @@ def execute(package_name: str, lines: int = DEFAULT_LINES) -> None:
 
     process = None
     try:
+        # Read raw bytes: container output is not guaranteed to be valid UTF-8,
+        # and a strict text-mode pipe would abort the stream on the first bad byte
         process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
-            text=True,
         )
 
         if process.stdout is None:
@@ -70,9 +74,9 @@ def execute(package_name: str, lines: int = DEFAULT_LINES) -> None:
             )
 
         for raw_line in process.stdout:
-            line = _strip_nonvisual_ansi(raw_line.rstrip("\n"))
-            entry = {"type": "journal", "line": line}
-            print(json.dumps(entry), flush=True)
+            for text in _split_lines(raw_line):
+                entry = {"type": "journal", "line": _strip_nonvisual_ansi(text)}
+                write_json_line(entry)
 
     except FileNotFoundError:
         raise APTBridgeError(
@@ -94,6 +98,26 @@ def execute(package_name: str, lines: int = DEFAULT_LINES) -> None:
             process.wait()
 
 
+def _split_lines(raw_line: bytes) -> list[str]:
+    """Decode a raw journal line and split it the way a text-mode pipe would.
+
+    A lone carriage return ends a line too, so progress redraws such as
+    "50%\\r60%\\r70%\\n" stream as separate lines instead of running together.
+    """
+    text = raw_line.decode("utf-8", "replace")
+    if "\r" not in text:
+        return [text.removesuffix("\n")]
+
+    lines = _LINE_BREAK_RE.split(text)
+    # Drop the empty remainder after the final line break
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
 def _strip_nonvisual_ansi(text: str) -> str:
     """Strip non-visual ANSI escape sequences (cursor, erase, etc.) but keep SGR colors."""
+    # Most journal lines are plain text; skip the regex when nothing can match
+    if "\x1b" not in text and "\r" not in text:
+        return text
     return _NONVISUAL_CSI_RE.sub("", text)
@@ -5,17 +5,28 @@ Updates package lists using apt-get update.
 Progress is output as JSON lines to stdout for streaming to frontend.
 """
 
-import json
 import os
-import re
+import selectors
 import subprocess
-from typing import Any
+import time
+from collections.abc import Iterator
+from typing import IO, Any
 
+from cockpit_container_apps.utils.apt_env import APT_ENV
+from cockpit_container_apps.utils.formatters import write_json_line
 from cockpit_container_apps.vendor.cockpit_apt_utils.errors import APTBridgeError
 
 # 5-minute timeout for apt-get update (covers slow mirrors)
 UPDATE_TIMEOUT_SECONDS = 300
 
+# Minimum interval between progress events unless the percentage advances.
+# Fast mirrors produce bursts of lines that the frontend doesn't need.
+PROGRESS_MIN_INTERVAL_SECONDS = 0.05
+
+# Emit a heartbeat progress event when apt-get has been silent this long,
+# e.g. while waiting on a stalled mirror
+HEARTBEAT_INTERVAL_SECONDS = 1.0
+
 
 def execute() -> dict[str, Any] | None:
     """
@@ -38,46 +49,63 @@ def execute() -> dict[str, Any] | None:
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            env={**os.environ, "DEBIAN_FRONTEND": "noninteractive"},
+            env=APT_ENV,
         )
 
+        deadline = time.monotonic() + UPDATE_TIMEOUT_SECONDS
         total_repos = 0
         completed_repos = 0
+        last_percentage = -1
+        last_emit = 0.0
         # Collect output for error diagnostics (stderr is merged into stdout)
         output_lines: list[str] = []
 
         if process.stdout:
-            for line in iter(process.stdout.readline, ""):
-                if not line:
-                    break
+            for line in _iter_output_lines(process.stdout, deadline):
+                if line is None:
+                    # No output for a while: keep the frontend informed
+                    heartbeat_json = {
+                        "type": "progress",
+                        "percentage": max(last_percentage, 0),
+                        "message": "Waiting for mirror response...",
+                    }
+                    write_json_line(heartbeat_json)
+                    continue
 
                 line = line.strip()
                 output_lines.append(line)
 
-                if line.startswith(("Get:", "Hit:", "Ign:")):
-                    match = re.match(r"(Get|Hit|Ign):(\d+)\s+(.+)", line)
-                    if match:
-                        repo_num = int(match.group(2))
-                        repo_url = match.group(3)
+                progress = _parse_progress_line(line)
+                if progress:
+                    tag, repo_num, repo_url = progress
 
-                        if repo_num > total_repos:
-                            total_repos = repo_num
+                    if repo_num > total_repos:
+                        total_repos = repo_num
 
-                        if match.group(1) in ("Hit", "Get"):
-                            completed_repos = repo_num
+                    if tag in ("Hit", "Get"):
+                        completed_repos = repo_num
 
-                        if total_repos > 0:
-                            percentage = int((completed_repos / total_repos) * 100)
+                    if total_repos > 0:
+                        percentage = int((completed_repos / total_repos) * 100)
+                        now = time.monotonic()
+
+                        # Coalesce bursts: skip events that neither advance the
+                        # percentage nor come after a quiet interval
+                        if (
+                            percentage > last_percentage
+                            or now - last_emit >= PROGRESS_MIN_INTERVAL_SECONDS
+                        ):
+                            last_percentage = percentage
+                            last_emit = now
                             progress_json = {
                                 "type": "progress",
                                 "percentage": percentage,
                                 "message": f"Updating: {repo_url[:60]}...",
                             }
-                            print(json.dumps(progress_json), flush=True)
+                            write_json_line(progress_json)
 
         try:
-            process.wait(timeout=UPDATE_TIMEOUT_SECONDS)
+            process.wait(timeout=max(deadline - time.monotonic(), 0))
         except subprocess.TimeoutExpired:
             process.kill()
             process.wait()
@@ -110,10 +138,10 @@ def execute() -> dict[str, Any] | None:
                 )
 
         final_progress = {"type": "progress", "percentage": 100, "message": "Package lists updated"}
-        print(json.dumps(final_progress), flush=True)
+        write_json_line(final_progress)
 
         final_result = {"success": True, "message": "Successfully updated package lists"}
-        print(json.dumps(final_result), flush=True)
+        write_json_line(final_result)
 
         return None
 
@@ -123,3 +151,71 @@ def execute() -> dict[str, Any] | None:
         raise APTBridgeError(
             "Error updating package lists", code="INTERNAL_ERROR", details=str(e)
         ) from e
+
+
+def _parse_progress_line(line: str) -> tuple[str, int, str] | None:
+    """Parse an apt-get update progress line such as 'Hit:1 http://... InRelease'.
+
+    Plain string operations are used instead of a regex since this runs for
+    every line of apt-get output.
+
+    Args:
+        line: Stripped output line from apt-get update
+
+    Returns:
+        Tuple of (tag, repository number, repository description), or None
+        if the line is not a Get/Hit/Ign progress line
+    """
+    if line[:4] not in ("Get:", "Hit:", "Ign:"):
+        return None
+
+    parts = line[4:].split(None, 1)
+    if len(parts) != 2 or not line[4:5].isdecimal() or not parts[0].isdecimal():
+        return None
+
+    return line[:3], int(parts[0]), parts[1]
+
+
+def _iter_output_lines(stream: IO[bytes], deadline: float) -> Iterator[str | None]:
+    """Read lines from a subprocess pipe without blocking on a silent process.
+
+    Stops at end of output, or early if the deadline passes.
+
+    Args:
+        stream: Binary stdout pipe of the subprocess
+        deadline: time.monotonic() value after which reading is abandoned
+
+    Yields:
+        Decoded output lines (without trailing newline) as they arrive, or
+        None each time no output has arrived for HEARTBEAT_INTERVAL_SECONDS
+    """
+    fd = stream.fileno()
+    os.set_blocking(fd, False)
+    buffer = b""
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(fd, selectors.EVENT_READ)
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+            if not selector.select(timeout=min(HEARTBEAT_INTERVAL_SECONDS, remaining)):
+                yield None
+                continue
+
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                continue
+
+            if not chunk:
+                break
+
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            for line in lines:
+                yield line.decode("utf-8", "replace")
+
+    if buffer:
+        yield buffer.decode("utf-8", "replace")
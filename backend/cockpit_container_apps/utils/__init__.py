@@ -10,6 +10,7 @@ from .store_config import (
     StoreConfig,
     StoreFilter,
     load_stores,
+    load_stores_by_id,
 )
 from .store_filter import (
     count_matching_packages,
@@ -22,6 +23,7 @@ __all__ = [
     "StoreConfig",
     "StoreFilter",
     "load_stores",
+    "load_stores_by_id",
     "count_matching_packages",
     "filter_packages",
     "matches_store_filter",
@@ -0,0 +1,10 @@
+"""Environment for apt-get subprocesses.
+
+Shared by the update, install and remove commands.
+"""
+
+import os
+
+# Built once per process: the commands are one-shot, and apt-get must
+# never stop to prompt
+APT_ENV = {**os.environ, "DEBIAN_FRONTEND": "noninteractive"}
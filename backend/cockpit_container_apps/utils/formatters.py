@@ -8,6 +8,7 @@ serialized to JSON by the CLI.
 
 Formatting Functions:
     to_json(data) - Convert any JSON-serializable data to formatted JSON string
+    write_json_line(data) - Write data to stdout as one compact JSON line
     format_package(pkg) - Format apt.Package for list views (compact)
     format_package_details(pkg) - Format apt.Package with full details
     format_dependency(dep_or) - Format dependency OR-group to list of dicts
@@ -51,6 +52,7 @@ Field Mappings:
 
 import json
 import logging
+import sys
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -71,6 +73,21 @@ def to_json(data: Any) -> str:
     return json.dumps(data, indent=2, ensure_ascii=False, sort_keys=False)
 
 
+def write_json_line(data: Any) -> None:
+    """Write data to stdout as a single compact JSON line and flush it.
+
+    Used by streaming commands (progress, journal) where the frontend reads
+    one JSON object per line. The line and its newline go out in a single
+    write call, followed by one flush.
+
+    Args:
+        data: JSON-serializable data to write
+    """
+    stream = sys.stdout
+    stream.write(json.dumps(data, separators=(",", ":")) + "\n")
+    stream.flush()
+
+
 def format_package(pkg: Any) -> dict[str, Any]:
     """Format an apt.Package object as a dictionary for list views.
 
@@ -83,9 +100,7 @@ def format_package(pkg: Any) -> dict[str, Any]:
     Returns:
         Dictionary with basic package information including categories
     """
-    from cockpit_container_apps.vendor.cockpit_apt_utils.debtag_parser import (
-        get_tags_by_facet,
-    )
+    from cockpit_container_apps.utils.tag_cache import get_tags_by_facet
 
     # Get candidate version (available for install)
     candidate = pkg.candidate
@@ -137,9 +152,7 @@ def format_package_details(pkg: Any) -> dict[str, Any]:
     Returns:
         Dictionary with comprehensive package information
     """
-    from cockpit_container_apps.vendor.cockpit_apt_utils.debtag_parser import (
-        get_tags_by_facet,
-    )
+    from cockpit_container_apps.utils.tag_cache import get_tags_by_facet
 
     candidate = pkg.candidate
     installed_version = pkg.installed
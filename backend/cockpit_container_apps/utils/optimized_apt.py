@@ -7,6 +7,7 @@ particularly for filtering packages by origin to avoid full cache iteration.
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -27,6 +28,22 @@ def get_package_names_by_origin_fast(origin_name: str) -> set[str]:
     Returns:
         Set of package names from the specified origin
     """
+    return get_package_names_by_origins_fast([origin_name])
+
+
+def get_package_names_by_origins_fast(origin_names: Iterable[str]) -> set[str]:
+    """Fast origin filtering for several origins in a single cache pass.
+
+    Args:
+        origin_names: Origin names to filter by (e.g., ["Hat Labs", "Debian"])
+
+    Returns:
+        Set of package names from any of the specified origins
+    """
+    origin_set = frozenset(origin_names)
+    if not origin_set:
+        return set()
+
     import os
 
     import apt_pkg
@@ -55,7 +72,8 @@ def get_package_names_by_origin_fast(origin_name: str) -> set[str]:
         os.close(old_stdout_fd)
         os.close(old_stderr_fd)
 
-    matching_names = set()
+    matching_names: set[str] = set()
+    add = matching_names.add
 
     # Iterate at C++ level - much faster than apt.Cache
     for pkg in cache.packages:
@@ -65,21 +83,17 @@ def get_package_names_by_origin_fast(origin_name: str) -> set[str]:
         # Check ALL versions for origin match, not just current_ver.
         # Installed packages have current_ver from dpkg status (empty origin),
         # but the repo version has the real origin metadata.
-        found = False
-        for ver in pkg.version_list:
-            if found:
-                break
-            for ver_file, _index in ver.file_list:
-                pkg_origin = ver_file.origin or ver_file.label or ""
-                if pkg_origin == origin_name:
-                    matching_names.add(pkg.name)
-                    found = True
-                    break
+        if any(
+            (ver_file.origin or ver_file.label or "") in origin_set
+            for ver in pkg.version_list
+            for ver_file, _index in ver.file_list
+        ):
+            add(pkg.name)
 
     logger.info(
-        "Fast origin filter found %d packages from '%s'",
+        "Fast origin filter found %d packages from %s",
         len(matching_names),
-        origin_name,
+        sorted(origin_set),
     )
 
     return matching_names
@@ -105,26 +119,7 @@ def get_packages_by_origin(cache: apt.Cache, origin_name: str) -> list[apt.Packa
         >>> print(f"Found {len(marine_packages)} packages from Hat Labs")
         Found 20 packages from Hat Labs
     """
-    # Use fast apt_pkg filtering to get package names
-    matching_names = get_package_names_by_origin_fast(origin_name)
-
-    # Only load the specific packages we need from apt.Cache
-    matching_packages = []
-    for name in matching_names:
-        try:
-            pkg = cache[name]
-            matching_packages.append(pkg)
-        except KeyError:
-            logger.debug("Package %s not found in cache", name)
-            continue
-
-    logger.info(
-        "Loaded %d packages from origin '%s'",
-        len(matching_packages),
-        origin_name,
-    )
-
-    return matching_packages
+    return get_packages_by_origins(cache, [origin_name])
 
 
 def get_packages_by_origins(cache: apt.Cache, origin_names: list[str]) -> list[apt.Package]:
@@ -149,18 +144,15 @@ def get_packages_by_origins(cache: apt.Cache, origin_names: list[str]) -> list[a
     if not origin_names:
         return []
 
-    # Collect package names from all origins
-    all_matching_names = set()
-    for origin_name in origin_names:
-        matching_names = get_package_names_by_origin_fast(origin_name)
-        all_matching_names.update(matching_names)
+    # Collect package names from all origins in a single cache pass
+    all_matching_names = get_package_names_by_origins_fast(origin_names)
 
     # Load the specific packages we need
-    matching_packages = []
+    matching_packages: list[apt.Package] = []
+    append = matching_packages.append
     for name in all_matching_names:
         try:
-            pkg = cache[name]
-            matching_packages.append(pkg)
+            append(cache[name])
         except KeyError:
             logger.debug("Package %s not found in cache", name)
             continue
@@ -7,6 +7,7 @@ Store configurations define filters for creating curated package collections
 
 from __future__ import annotations
 
+import functools
 import logging
 from dataclasses import dataclass
 from pathlib import Path
@@ -74,6 +75,11 @@ class StoreConfig:
         if not self.id or not self.id.replace("-", "").replace("_", "").isalnum():
             raise ValueError(f"Invalid store ID: {self.id}")
 
+    @functools.cached_property
+    def category_metadata_by_id(self) -> dict[str, CategoryMetadata]:
+        """Category metadata keyed by category ID (empty if none configured)."""
+        return {meta.id: meta for meta in self.category_metadata or []}
+
 
 def _validate_store_dict(data: dict[str, Any], filepath: Path) -> None:
     """Validate required fields in store configuration.
@@ -252,3 +258,15 @@ def load_stores(config_dir: Path | None = None) -> list[StoreConfig]:
 
     logger.info("Loaded %d store configuration(s)", len(stores))
     return stores
+
+
+def load_stores_by_id(config_dir: Path | None = None) -> dict[str, StoreConfig]:
+    """Load all store configurations keyed by store ID.
+
+    Args:
+        config_dir: Optional override for config directory (for testing)
+
+    Returns:
+        Dictionary mapping store ID to StoreConfig (empty if no stores installed)
+    """
+    return {store.id: store for store in load_stores(config_dir)}
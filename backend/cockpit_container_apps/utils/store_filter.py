@@ -10,8 +10,7 @@ import logging
 from typing import TYPE_CHECKING
 
 from cockpit_container_apps.utils.optimized_apt import get_packages_by_origins
-from cockpit_container_apps.vendor.cockpit_apt_utils.debtag_parser import parse_package_tags
-from cockpit_container_apps.vendor.cockpit_apt_utils.repository_parser import get_package_repository
+from cockpit_container_apps.utils.tag_cache import has_tag
 
 if TYPE_CHECKING:
     import apt
@@ -48,43 +47,45 @@ def matches_store_filter(package: apt.Package, store: StoreConfig) -> bool:
     """
     filters = store.filters
 
-    # Collect match results for each specified filter type
-    matches = []
+    # Return True as soon as ANY filter matches (OR logic between filter types).
+    # Cheapest checks run first: the name needs no APT lookup at all, while
+    # sections, origins and tags each read from the candidate version.
+    if filters.include_packages and _matches_packages_filter(package, filters.include_packages):
+        return True
 
-    if filters.include_origins:
-        matches.append(_matches_origin_filter(package, filters.include_origins))
+    if filters.include_sections and _matches_section_filter(package, filters.include_sections):
+        return True
 
-    if filters.include_sections:
-        matches.append(_matches_section_filter(package, filters.include_sections))
+    if filters.include_origins and _matches_origin_filter(package, filters.include_origins):
+        return True
 
-    if filters.include_tags:
-        matches.append(_matches_tags_filter(package, filters.include_tags))
-
-    if filters.include_packages:
-        matches.append(_matches_packages_filter(package, filters.include_packages))
-
-    # Return True if ANY filter matched (OR logic between filter types)
-    return any(matches)
+    return bool(filters.include_tags) and _matches_tags_filter(package, filters.include_tags)
 
 
 def _matches_origin_filter(package: apt.Package, origins: list[str]) -> bool:
     """Check if package origin matches any of the specified origins.
 
+    All origins of the candidate version are checked, not just the first
+    one, since a version is often available from several repositories.
+
     Args:
         package: APT package object
         origins: List of acceptable origin names
 
     Returns:
-        True if package origin is in the list (OR logic)
+        True if any candidate origin is in the list (OR logic)
     """
-    repo = get_package_repository(package)
-    if repo is None:
-        return False
+    try:
+        candidate = package.candidate
+        if candidate is None:
+            return False
 
-    # Match on origin (or label if origin is empty)
-    package_origin = repo.origin if repo.origin else repo.label
+        # Match on origin (or label if origin is empty)
+        return any((origin.origin or origin.label) in origins for origin in candidate.origins)
 
-    return package_origin in origins
+    except (AttributeError, TypeError):
+        logger.debug("Error getting origins for package %s", package.name)
+        return False
 
 
 def _matches_section_filter(package: apt.Package, sections: list[str]) -> bool:
@@ -98,10 +99,11 @@ def _matches_section_filter(package: apt.Package, sections: list[str]) -> bool:
         True if package section is in the list (OR logic)
     """
     try:
-        if not hasattr(package, "candidate") or package.candidate is None:
+        candidate = package.candidate
+        if candidate is None:
             return False
 
-        section = package.candidate.section
+        section = candidate.section
         if not section:
             return False
 
@@ -122,13 +124,8 @@ def _matches_tags_filter(package: apt.Package, tags: list[str]) -> bool:
     Returns:
         True if package has at least one matching tag (OR logic)
     """
-    package_tags = parse_package_tags(package)
-
-    if not package_tags:
-        return False
-
     # OR logic: package needs at least one matching tag
-    return any(tag in package_tags for tag in tags)
+    return any(has_tag(package, tag) for tag in tags)
 
 
 def _matches_packages_filter(package: apt.Package, packages: list[str]) -> bool:
@@ -0,0 +1,106 @@
+"""Cache of parsed package debtags.
+
+A single command often looks at the same package's tags several times:
+the store filter checks include_tags, format_package extracts categories,
+display name and status, and the category counter extracts categories
+again. Each of those would otherwise re-read the candidate record and
+re-parse its Tag field.
+
+This module parses the tags of each package once and serves all later
+lookups from memory. Entries are held weakly by package, so they go away
+together with the package: a full cache scan that looks at each package
+once does not keep the packages it has passed alive.
+"""
+
+from __future__ import annotations
+
+import weakref
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from cockpit_container_apps.vendor.cockpit_apt_utils.debtag_parser import parse_package_tags
+
+if TYPE_CHECKING:
+    import apt
+
+
+class _ParsedTags(NamedTuple):
+    # Full tag strings, for membership checks
+    tags: frozenset[str]
+    # Facet -> values, in the order they are declared in the Tag field
+    facets: dict[str, tuple[str, ...]]
+
+
+_parsed_tags: weakref.WeakKeyDictionary[Any, _ParsedTags] = weakref.WeakKeyDictionary()
+
+
+def _parse_tags(package: apt.Package) -> _ParsedTags:
+    tags = parse_package_tags(package)
+
+    facets: dict[str, list[str]] = {}
+    for tag in tags:
+        facet, _, value = tag.partition("::")
+        facets.setdefault(facet, []).append(value)
+
+    return _ParsedTags(frozenset(tags), {facet: tuple(values) for facet, values in facets.items()})
+
+
+def _get_parsed_tags(package: apt.Package) -> _ParsedTags:
+    try:
+        return _parsed_tags[package]
+    except KeyError:
+        pass
+    except TypeError:
+        # Not hashable or not weakly referenceable: nothing to cache on
+        return _parse_tags(package)
+
+    parsed = _parse_tags(package)
+    _parsed_tags[package] = parsed
+    return parsed
+
+
+def get_parsed_tags(package: apt.Package) -> Mapping[str, tuple[str, ...]]:
+    """Get the debtags of a package grouped by facet.
+
+    Args:
+        package: APT package object
+
+    Returns:
+        Read-only mapping of facet (e.g., "category") to its values in Tag
+        field order (e.g., ("navigation", "monitoring")). Tags without a facet
+        separator are stored under the full tag with an empty value.
+    """
+    return MappingProxyType(_get_parsed_tags(package).facets)
+
+
+def has_tag(package: apt.Package, tag: str) -> bool:
+    """Check if a package has a specific tag.
+
+    Args:
+        package: APT package object
+        tag: Full tag string (e.g., "role::container-store")
+
+    Returns:
+        True if the package has the tag
+    """
+    return tag in _get_parsed_tags(package).tags
+
+
+def get_tags_by_facet(package: apt.Package, facet: str) -> list[str]:
+    """Get the values of all tags in a facet.
+
+    Args:
+        package: APT package object
+        facet: Facet name (e.g., "category")
+
+    Returns:
+        List of tag values in the facet, in Tag field order
+        (e.g., ["navigation", "monitoring"])
+    """
+    return list(_get_parsed_tags(package).facets.get(facet, ()))
+
+
+def clear_tag_cache() -> None:
+    """Drop all cached tags."""
+    _parsed_tags.clear()
@@ -0,0 +1,27 @@
+"""
+Helpers for decoding the JSON-lines output streamed by commands.
+"""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def iter_ndjson(buffer: str) -> Iterator[Any]:
+    """Decode each JSON value in a newline-delimited buffer, skipping blank lines.
+
+    Decodes in place with one shared decoder instead of splitting the
+    buffer into lines and calling json.loads on each.
+    """
+    end = len(buffer)
+    index = 0
+    while True:
+        while index < end and buffer[index] in _WHITESPACE:
+            index += 1
+        if index >= end:
+            return
+        value, index = _DECODER.raw_decode(buffer, index)
+        yield value
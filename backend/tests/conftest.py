@@ -2,10 +2,13 @@
 Pytest configuration and shared fixtures for cockpit-container-apps tests.
 """
 
+import inspect
 from unittest.mock import MagicMock
 
 import pytest
 
+from cockpit_container_apps.utils.tag_cache import clear_tag_cache
+
 
 def pytest_configure(config):
     """Configure pytest to suppress OSError during capture cleanup.
@@ -31,10 +34,40 @@ def pytest_configure(config):
     capture.FDCapture.done = patched_done
 
 
+def pytest_collection_modifyitems(config, items):
+    """Reject test modules that use autospec=True.
+
+    autospec introspects the real object's signature on every patch and is
+    by far the most expensive way to build a mock. None of the tests need
+    it, so keep it from creeping in as the suite grows.
+    """
+    offenders = set()
+    checked = set()
+    for item in items:
+        module = getattr(item, "module", None)
+        if module is None or module.__name__ in checked:
+            continue
+        checked.add(module.__name__)
+        try:
+            source = inspect.getsource(module)
+        except (OSError, TypeError):
+            continue
+        if "autospec=True" in source:
+            offenders.add(module.__file__)
+
+    if offenders:
+        raise pytest.UsageError(
+            "autospec=True is not allowed in tests (use Mock or a small fake): "
+            + ", ".join(sorted(offenders))
+        )
+
+
 @pytest.fixture(autouse=True)
 def reset_apt_cache():
     """Ensure each test starts with clean state."""
+    clear_tag_cache()
     yield
+    clear_tag_cache()
 
 
 @pytest.fixture(scope="session")
@@ -68,7 +68,7 @@ class TestGetStoreData:
     """Tests for get_store_data command."""
 
     @pytest.mark.skip(reason="Redundant - tested in test_optimized_apt.py with real data")
-    @patch("cockpit_container_apps.commands.get_store_data.load_stores")
+    @patch("cockpit_container_apps.utils.store_config.load_stores")
     def test_get_store_data_success(self, mock_load_stores, marine_packages):
         """Test successful retrieval of consolidated store data."""
         # Mock the store configuration
@@ -129,7 +129,7 @@ class TestGetStoreData:
         assert nav_category["count_installed"] == 0
         assert nav_category["count_available"] == 1
 
-    @patch("cockpit_container_apps.commands.get_store_data.load_stores")
+    @patch("cockpit_container_apps.utils.store_config.load_stores")
     def test_store_not_found(self, mock_load_stores):
         """Test error when store doesn't exist."""
         mock_load_stores.return_value = []
@@ -143,7 +143,7 @@ class TestGetStoreData:
 
             assert exc_info.value.code == "STORE_NOT_FOUND"
 
-    @patch("cockpit_container_apps.commands.get_store_data.load_stores")
+    @patch("cockpit_container_apps.utils.store_config.load_stores")
     def test_empty_store_name(self, mock_load_stores):
         """Test error when store name is empty."""
         mock_apt = MagicMock()
@@ -156,7 +156,7 @@ class TestGetStoreData:
             assert "cannot be empty" in str(exc_info.value.message).lower()
 
     @pytest.mark.skip(reason="Redundant - tested in test_optimized_apt.py with real data")
-    @patch("cockpit_container_apps.commands.get_store_data.load_stores")
+    @patch("cockpit_container_apps.utils.store_config.load_stores")
     def test_performance_with_large_cache(self, mock_load_stores, marine_packages):
         """Test that pre-filtering works with large APT cache."""
         from cockpit_container_apps.utils.store_config import StoreConfig, StoreFilter
@@ -197,7 +197,7 @@ class TestGetStoreData:
         package_names = [p["name"] for p in result["packages"]]
         assert all("container" in name for name in package_names)
 
-    @patch("cockpit_container_apps.commands.get_store_data.load_stores")
+    @patch("cockpit_container_apps.utils.store_config.load_stores")
     def test_categories_sorted_alphabetically(self, mock_load_stores, marine_packages):
         """Test that categories are sorted by label."""
         from cockpit_container_apps.utils.store_config import StoreConfig, StoreFilter
@@ -225,7 +225,7 @@ class TestGetStoreData:
         labels = [c["label"] for c in result["categories"]]
         assert labels == sorted(labels)
 
-    @patch("cockpit_container_apps.commands.get_store_data.load_stores")
+    @patch("cockpit_container_apps.utils.store_config.load_stores")
     def test_apt_cache_error(self, mock_load_stores):
         """Test error handling when APT cache fails to open."""
         from cockpit_container_apps.utils.store_config import StoreConfig, StoreFilter
@@ -148,6 +148,29 @@ def test_list_categories_counts_correct(mock_cache_with_categories):
     assert category_dict["visualization"]["count"] == 1
 
 
+def test_list_categories_state_counts(marine_packages):
+    """Test that installed and available counts partition the total count."""
+    # Mark the navigation packages as installed
+    for pkg in marine_packages:
+        if pkg.name in ("opencpn-container", "signalk-server-container"):
+            pkg.is_installed = True
+
+    mock_apt = MagicMock()
+    mock_apt.Cache = MagicMock(return_value=MockCache(marine_packages))
+    with patch.dict("sys.modules", {"apt": mock_apt}):
+        result = list_categories.execute()
+
+    category_dict = {c["id"]: c for c in result}
+
+    assert category_dict["navigation"]["count_all"] == 2
+    assert category_dict["navigation"]["count_installed"] == 1
+    assert category_dict["navigation"]["count_available"] == 1
+    assert category_dict["monitoring"]["count_installed"] == 1
+    assert category_dict["monitoring"]["count_available"] == 2
+    assert category_dict["visualization"]["count_installed"] == 0
+    assert category_dict["visualization"]["count_available"] == 1
+
+
 def test_list_categories_auto_derived_labels(mock_cache_with_categories):
     """Test that labels are auto-derived from category IDs."""
     mock_apt = MagicMock()
@@ -181,7 +204,7 @@ def test_list_categories_store_not_found(mock_cache_with_categories):
     mock_apt.Cache = MagicMock(return_value=mock_cache_with_categories)
 
     with patch.dict("sys.modules", {"apt": mock_apt}), patch(
-        "cockpit_container_apps.commands.list_categories.load_stores"
+        "cockpit_container_apps.utils.store_config.load_stores"
     ) as mock_load:
         mock_load.return_value = []  # No stores available
 
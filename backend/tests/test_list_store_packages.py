@@ -1,9 +1,55 @@
 """Tests for list_store_packages command."""
 
-from unittest.mock import MagicMock, patch
+import subprocess
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
 
 from cockpit_container_apps.commands import list_store_packages
 
+# (package name, expected store ID) pairs for _derive_store_id
+_DERIVE_STORE_ID_CASES = (
+    ("marine-container-store", "marine"),
+    ("casaos-container-store", "casaos"),
+    ("custom-name-container-store", "custom-name"),
+    # Edge case: package without standard suffix
+    ("other-package", "other-package"),
+)
+
+
+class _FakeCache:
+    """Minimal apt.Cache stand-in: iteration and lookup by name."""
+
+    def __init__(self, packages: list[SimpleNamespace]):
+        self._packages = {pkg.name: pkg for pkg in packages}
+
+    def __iter__(self):
+        return iter(self._packages.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._packages
+
+    def __getitem__(self, name: str) -> SimpleNamespace:
+        return self._packages[name]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def patched_cache():
+    """Patch apt.Cache once for the module; tests set the cache it returns."""
+    with patch("apt.Cache") as mock_cache_class:
+        yield mock_cache_class
+
+
+@pytest.fixture(autouse=True)
+def no_dctrl_tools():
+    """Force the full cache scan unless a test opts into the tag index."""
+    with patch(
+        "cockpit_container_apps.commands.list_store_packages.shutil.which",
+        return_value=None,
+    ) as mock_which:
+        yield mock_which
+
 
 def create_mock_package(
     name: str,
@@ -11,139 +57,178 @@ def create_mock_package(
     installed: bool = False,
     version: str = "1.0.0",
     summary: str = "Test package",
-) -> MagicMock:
-    """Create a mock apt package with optional tags."""
-    pkg = MagicMock()
-    pkg.name = name
-    pkg.is_installed = installed
-
-    pkg.candidate = MagicMock()
-    pkg.candidate.version = version
-    pkg.candidate.summary = summary
-
-    # Set up the Tag field in the record
-    if tags:
-        pkg.candidate.record = {"Tag": ", ".join(tags)}
-    else:
-        pkg.candidate.record = {}
-
-    if installed:
-        pkg.installed = MagicMock()
-        pkg.installed.version = version
-        pkg.installed.summary = summary
-    else:
-        pkg.installed = None
-
-    return pkg
-
-
-def test_list_store_packages_empty():
-    """Test listing store packages when none are available."""
-    mock_cache = MagicMock()
-    mock_cache.__iter__ = lambda self: iter([])
-
-    with patch("apt.Cache", return_value=mock_cache):
-        result = list_store_packages.execute()
+) -> SimpleNamespace:
+    """Create a stub apt package with optional tags.
+
+    list_store_packages only reads attributes, so plain namespaces are
+    enough and much cheaper to build than MagicMocks.
+    """
+    return SimpleNamespace(
+        name=name,
+        is_installed=installed,
+        candidate=SimpleNamespace(
+            version=version,
+            summary=summary,
+            record={"Tag": ", ".join(tags)} if tags else {},
+        ),
+        installed=SimpleNamespace(version=version, summary=summary) if installed else None,
+    )
+
+
+@pytest.mark.parametrize(
+    ("packages", "expected"),
+    [
+        pytest.param([], [], id="empty"),
+        pytest.param(
+            [
+                create_mock_package(
+                    "marine-container-store",
+                    tags=["role::container-store"],
+                    installed=True,
+                    version="0.2.0-1",
+                    summary="Marine container application store",
+                ),
+                create_mock_package(
+                    "casaos-container-store",
+                    tags=["role::container-store"],
+                    installed=False,
+                    version="1.0.0-1",
+                    summary="CasaOS container application store",
+                ),
+                # Non-store package (should be filtered out)
+                create_mock_package(
+                    "signalk-server-container",
+                    tags=["role::container-app", "field::marine"],
+                    installed=True,
+                    version="2.18.0-1",
+                    summary="Signal K Server",
+                ),
+            ],
+            # Sorted alphabetically by package name
+            [
+                {
+                    "package_name": "casaos-container-store",
+                    "store_id": "casaos",
+                    "description": "CasaOS container application store",
+                    "installed": False,
+                    "version": "1.0.0-1",
+                },
+                {
+                    "package_name": "marine-container-store",
+                    "store_id": "marine",
+                    "description": "Marine container application store",
+                    "installed": True,
+                    "version": "0.2.0-1",
+                },
+            ],
+            id="with_stores",
+        ),
+        pytest.param(
+            [create_mock_package("some-package", tags=None, installed=True)],
+            [],
+            id="no_tags",
+        ),
+        pytest.param(
+            [create_mock_package("test-container-app", tags=["role::container-app"])],
+            [],
+            id="wrong_tag",
+        ),
+    ],
+)
+def test_list_store_packages(patched_cache, packages, expected):
+    """Test that only role::container-store packages are listed."""
+    patched_cache.return_value = _FakeCache(packages)
+
+    result = list_store_packages.execute()
 
-    assert result == {"store_packages": []}
+    assert result == {"store_packages": expected}
 
 
-def test_list_store_packages_with_stores():
-    """Test listing store packages when some are available."""
+def test_list_store_packages_uses_tag_index(patched_cache):
+    """Test that only packages found in the tag index are checked."""
     mock_packages = [
         create_mock_package(
             "marine-container-store",
             tags=["role::container-store"],
             installed=True,
             version="0.2.0-1",
-            summary="Marine container application store",
         ),
+        # Not reported by the index, so never considered
         create_mock_package(
             "casaos-container-store",
             tags=["role::container-store"],
-            installed=False,
-            version="1.0.0-1",
-            summary="CasaOS container application store",
         ),
-        # Non-store package (should be filtered out)
+        # Substring match in the index, rejected by the exact tag check
         create_mock_package(
-            "signalk-server-container",
-            tags=["role::container-app", "field::marine"],
-            installed=True,
-            version="2.18.0-1",
-            summary="Signal K Server",
+            "other-package",
+            tags=["role::container-store-tools"],
         ),
     ]
+    tagged_names = {"marine-container-store", "other-package", "not-in-cache"}
 
-    mock_cache = MagicMock()
-    mock_cache.__iter__ = lambda self: iter(mock_packages)
+    patched_cache.return_value = _FakeCache(mock_packages)
 
-    with patch("apt.Cache", return_value=mock_cache):
+    with patch.object(list_store_packages, "_package_names_with_tag", return_value=tagged_names):
         result = list_store_packages.execute()
 
-    assert "store_packages" in result
-    store_packages = result["store_packages"]
-    assert len(store_packages) == 2
-
-    # Check first package (casaos - alphabetical order)
-    assert store_packages[0]["package_name"] == "casaos-container-store"
-    assert store_packages[0]["store_id"] == "casaos"
-    assert store_packages[0]["installed"] is False
-    assert store_packages[0]["version"] == "1.0.0-1"
-    assert store_packages[0]["description"] == "CasaOS container application store"
-
-    # Check second package (marine)
-    assert store_packages[1]["package_name"] == "marine-container-store"
-    assert store_packages[1]["store_id"] == "marine"
-    assert store_packages[1]["installed"] is True
-    assert store_packages[1]["version"] == "0.2.0-1"
+    assert [p["package_name"] for p in result["store_packages"]] == ["marine-container-store"]
 
 
-def test_list_store_packages_no_tags():
-    """Test that packages without tags are excluded."""
-    mock_packages = [
-        create_mock_package(
-            "some-package",
-            tags=None,  # No tags
-            installed=True,
+def test_package_names_with_tag():
+    """Test collecting package names from dctrl-tools output."""
+    outputs = {
+        "/usr/bin/grep-aptavail": subprocess.CompletedProcess(
+            [], 0, stdout="marine-container-store\ncasaos-container-store\n"
         ),
-    ]
+        "/usr/bin/grep-status": subprocess.CompletedProcess(
+            [], 0, stdout="marine-container-store\n"
+        ),
+    }
 
-    mock_cache = MagicMock()
-    mock_cache.__iter__ = lambda self: iter(mock_packages)
+    with patch(
+        "cockpit_container_apps.commands.list_store_packages.shutil.which",
+        side_effect=lambda tool: f"/usr/bin/{tool}",
+    ), patch(
+        "cockpit_container_apps.commands.list_store_packages.subprocess.run",
+        side_effect=lambda cmd, **kwargs: outputs[cmd[0]],
+    ):
+        names = list_store_packages._package_names_with_tag("role::container-store")
 
-    with patch("apt.Cache", return_value=mock_cache):
-        result = list_store_packages.execute()
+    assert names == {"marine-container-store", "casaos-container-store"}
 
-    assert result == {"store_packages": []}
 
+def test_package_names_with_tag_no_matches():
+    """Test that grep-dctrl's no-match exit status yields an empty set."""
+    with patch(
+        "cockpit_container_apps.commands.list_store_packages.shutil.which",
+        side_effect=lambda tool: f"/usr/bin/{tool}",
+    ), patch(
+        "cockpit_container_apps.commands.list_store_packages.subprocess.run",
+        return_value=subprocess.CompletedProcess([], 1, stdout=""),
+    ):
+        names = list_store_packages._package_names_with_tag("role::container-store")
 
-def test_list_store_packages_wrong_tag():
-    """Test that packages with different tags are excluded."""
-    mock_packages = [
-        create_mock_package(
-            "test-container-app",
-            tags=["role::container-app"],  # Wrong tag
-            installed=True,
-        ),
-    ]
+    assert names == set()
 
-    mock_cache = MagicMock()
-    mock_cache.__iter__ = lambda self: iter(mock_packages)
 
-    with patch("apt.Cache", return_value=mock_cache):
-        result = list_store_packages.execute()
+def test_package_names_with_tag_without_dctrl_tools():
+    """Test fallback when dctrl-tools is not installed."""
+    assert list_store_packages._package_names_with_tag("role::container-store") is None
+
 
-    assert result == {"store_packages": []}
+def test_package_names_with_tag_query_error():
+    """Test fallback when a dctrl-tools query fails."""
+    with patch(
+        "cockpit_container_apps.commands.list_store_packages.shutil.which",
+        side_effect=lambda tool: f"/usr/bin/{tool}",
+    ), patch(
+        "cockpit_container_apps.commands.list_store_packages.subprocess.run",
+        return_value=subprocess.CompletedProcess([], 2, stdout="", stderr="bad"),
+    ):
+        assert list_store_packages._package_names_with_tag("role::container-store") is None
 
 
-def test_derive_store_id():
+@pytest.mark.parametrize(("package_name", "expected"), _DERIVE_STORE_ID_CASES)
+def test_derive_store_id(package_name, expected):
     """Test store ID derivation from package name."""
-    assert list_store_packages._derive_store_id("marine-container-store") == "marine"
-    assert list_store_packages._derive_store_id("casaos-container-store") == "casaos"
-    assert (
-        list_store_packages._derive_store_id("custom-name-container-store")
-        == "custom-name"
-    )
-    # Edge case: package without standard suffix
-    assert list_store_packages._derive_store_id("other-package") == "other-package"
+    assert list_store_packages._derive_store_id(package_name) == expected
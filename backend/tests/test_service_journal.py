@@ -2,62 +2,101 @@
 Unit tests for service_journal command.
 """
 
-import json
-from unittest.mock import MagicMock, patch
+import io
+import re
+import tracemalloc
+from unittest.mock import Mock, patch
 
 import pytest
 
 from cockpit_container_apps.commands import service_journal
 from cockpit_container_apps.vendor.cockpit_apt_utils.errors import APTBridgeError
+from tests._json_stream import iter_ndjson
 
+# journalctl invocation expected for a unit and line count
+_EXPECTED_CMD_TEMPLATE = (
+    "journalctl",
+    "-u", "{unit}",
+    "-o", "cat",
+    "-n", "{n}",
+    "-f",
+    "--no-pager",
+)
 
-def _make_mock_process(lines: list[str]) -> MagicMock:
-    """Create a mock Popen process with given stdout lines."""
-    mock_process = MagicMock()
-    mock_stdout = MagicMock()
-    mock_stdout.__iter__ = MagicMock(return_value=iter(lines))
-    mock_process.stdout = mock_stdout
-    mock_process.stderr = MagicMock()
-    mock_process.terminate = MagicMock()
-    mock_process.wait = MagicMock()
-    return mock_process
+# Inputs for _strip_nonvisual_ansi
+_ERASE_LINE = "\x1b[2Kfoo"
+_ERASE_LINE_NO_NUMBER = "\x1b[Kfoo"
+_CURSOR_UP = "\x1b[1Afoo"
+_CURSOR_MOVEMENT = "\x1b[5Gfoo"
+_CARRIAGE_RETURN = "foo\rbar"
+_SGR_COLORS = "\x1b[32mgreen\x1b[0m"
+_PLAIN_TEXT = "plain text"
+_MIXED_CODES = "\x1b[2K\x1b[32mgreen\x1b[0m rest"
+_CURSOR_UP_AND_ERASE = "\x1b[1A\x1b[2KDone"
 
 
+class _FailingStdout(io.BytesIO):
+    """Journal stream whose iteration fails, as a broken pipe would."""
+
+    def __iter__(self):
+        raise RuntimeError("read failed")
+
+
+class _FakePopen:
+    """Minimal journalctl process: a byte stream of output plus call counters."""
+
+    __slots__ = ("stdout", "terminate_calls", "wait_calls")
+
+    def __init__(self, lines: list[str | bytes]):
+        # str lines are UTF-8 encoded, bytes lines are passed through as-is
+        self.stdout = io.BytesIO(
+            b"".join(line.encode() if isinstance(line, str) else line for line in lines)
+        )
+        self.terminate_calls = 0
+        self.wait_calls = 0
+
+    def terminate(self) -> None:
+        self.terminate_calls += 1
+
+    def wait(self) -> None:
+        self.wait_calls += 1
+
+
+@patch("cockpit_container_apps.commands.service_journal.subprocess.Popen", new_callable=Mock)
 class TestServiceJournal:
     """Tests for service_journal command."""
 
-    def test_validate_package_name(self):
+    def test_validate_package_name(self, mock_popen):
         """Test that invalid package names are rejected."""
         with pytest.raises(APTBridgeError):
             service_journal.execute("../evil")
 
-    def test_empty_package_name(self):
+    def test_empty_package_name(self, mock_popen):
         """Test that empty package names are rejected."""
         with pytest.raises(APTBridgeError):
             service_journal.execute("")
 
-    def test_invalid_line_count_zero(self):
+    def test_invalid_line_count_zero(self, mock_popen):
         """Test that zero line count is rejected."""
         with pytest.raises(APTBridgeError) as exc_info:
             service_journal.execute("test-package", lines=0)
         assert exc_info.value.code == "INVALID_INPUT"
 
-    def test_invalid_line_count_negative(self):
+    def test_invalid_line_count_negative(self, mock_popen):
         """Test that negative line count is rejected."""
         with pytest.raises(APTBridgeError) as exc_info:
             service_journal.execute("test-package", lines=-1)
         assert exc_info.value.code == "INVALID_INPUT"
 
-    def test_invalid_line_count_too_large(self):
+    def test_invalid_line_count_too_large(self, mock_popen):
         """Test that excessively large line count is rejected."""
         with pytest.raises(APTBridgeError) as exc_info:
             service_journal.execute("test-package", lines=10001)
         assert exc_info.value.code == "INVALID_INPUT"
 
-    @patch("cockpit_container_apps.commands.service_journal.subprocess.Popen")
     def test_streams_journal_lines(self, mock_popen, capsys):
         """Test that journal lines are streamed as JSON."""
-        mock_popen.return_value = _make_mock_process([
+        mock_popen.return_value = _FakePopen([
             "Starting test-package.service\n",
             "Container test  Created\n",
         ])
@@ -65,122 +104,187 @@ class TestServiceJournal:
         service_journal.execute("test-package", lines=10)
 
         captured = capsys.readouterr()
-        lines = [json.loads(entry) for entry in captured.out.strip().split("\n")]
+        lines = list(iter_ndjson(captured.out))
 
         assert len(lines) == 2
         assert lines[0] == {"type": "journal", "line": "Starting test-package.service"}
         assert lines[1] == {"type": "journal", "line": "Container test  Created"}
 
-    @patch("cockpit_container_apps.commands.service_journal.subprocess.Popen")
     def test_strips_erase_line_ansi(self, mock_popen, capsys):
         """Test that erase-line ANSI codes are stripped."""
-        mock_popen.return_value = _make_mock_process([
+        mock_popen.return_value = _FakePopen([
             "\x1b[2Ktraefik | Starting\n",
         ])
 
         service_journal.execute("test-package")
 
         captured = capsys.readouterr()
-        result = json.loads(captured.out.strip())
+        [result] = iter_ndjson(captured.out)
         assert result["line"] == "traefik | Starting"
 
-    @patch("cockpit_container_apps.commands.service_journal.subprocess.Popen")
     def test_preserves_color_ansi(self, mock_popen, capsys):
         """Test that color ANSI codes are preserved."""
-        mock_popen.return_value = _make_mock_process([
+        mock_popen.return_value = _FakePopen([
             "\x1b[32minfo\x1b[0m message\n",
         ])
 
         service_journal.execute("test-package")
 
         captured = capsys.readouterr()
-        result = json.loads(captured.out.strip())
+        [result] = iter_ndjson(captured.out)
         assert "\x1b[32m" in result["line"]
         assert "\x1b[0m" in result["line"]
 
-    @patch("cockpit_container_apps.commands.service_journal.subprocess.Popen")
-    def test_builds_correct_command(self, mock_popen):
+    def test_replaces_invalid_utf8(self, mock_popen, capsys):
+        """Test that invalid UTF-8 in container output doesn't abort the stream."""
+        mock_popen.return_value = _FakePopen([
+            b"bad byte \xff here\n",
+            "temperature 21\u00b0C\n",
+        ])
+
+        service_journal.execute("test-package")
+
+        captured = capsys.readouterr()
+        lines = list(iter_ndjson(captured.out))
+        assert lines[0]["line"] == "bad byte \ufffd here"
+        assert lines[1]["line"] == "temperature 21\u00b0C"
+
+    def test_carriage_returns_split_lines(self, mock_popen, capsys):
+        """Test that lone carriage returns end lines, as in a text-mode pipe."""
+        mock_popen.return_value = _FakePopen([
+            "50%\r60%\r70%\n",
+            "Done\r\n",
+        ])
+
+        service_journal.execute("test-package")
+
+        captured = capsys.readouterr()
+        assert [entry["line"] for entry in iter_ndjson(captured.out)] == [
+            "50%",
+            "60%",
+            "70%",
+            "Done",
+        ]
+
+    @pytest.mark.parametrize(
+        ("package_name", "lines"),
+        [("halos-core-containers", 100), ("signalk-server-container", 1)],
+    )
+    def test_builds_correct_command(self, mock_popen, package_name, lines):
         """Test that journalctl is called with correct arguments."""
-        mock_popen.return_value = _make_mock_process([])
+        mock_popen.return_value = _FakePopen([])
 
-        service_journal.execute("halos-core-containers", lines=100)
+        service_journal.execute(package_name, lines=lines)
 
         mock_popen.assert_called_once()
         cmd = mock_popen.call_args[0][0]
-        assert cmd == [
-            "journalctl",
-            "-u", "halos-core-containers.service",
-            "-o", "cat",
-            "-n", "100",
-            "-f",
-            "--no-pager",
-        ]
+        assert tuple(cmd) == tuple(
+            arg.format(unit=f"{package_name}.service", n=lines) for arg in _EXPECTED_CMD_TEMPLATE
+        )
 
-    @patch("cockpit_container_apps.commands.service_journal.subprocess.Popen")
     def test_terminates_process_on_exit(self, mock_popen):
         """Test that journalctl process is cleaned up."""
-        mock_process = _make_mock_process([])
-        mock_popen.return_value = mock_process
+        process = _FakePopen([])
+        mock_popen.return_value = process
 
         service_journal.execute("test-package")
 
-        mock_process.terminate.assert_called_once()
-        mock_process.wait.assert_called_once()
+        assert process.terminate_calls == 1
+        assert process.wait_calls == 1
 
-    @patch("cockpit_container_apps.commands.service_journal.subprocess.Popen")
     def test_terminates_process_on_error(self, mock_popen):
         """Test that journalctl process is cleaned up even on error."""
-        mock_process = _make_mock_process([])
-        mock_process.stdout.__iter__ = MagicMock(side_effect=RuntimeError("read failed"))
-        mock_popen.return_value = mock_process
+        process = _FakePopen([])
+        process.stdout = _FailingStdout()
+        mock_popen.return_value = process
 
         with pytest.raises(APTBridgeError):
             service_journal.execute("test-package")
 
-        mock_process.terminate.assert_called_once()
-        mock_process.wait.assert_called_once()
+        assert process.terminate_calls == 1
+        assert process.wait_calls == 1
 
-    @patch(
-        "cockpit_container_apps.commands.service_journal.subprocess.Popen",
-        side_effect=FileNotFoundError(),
-    )
     def test_journalctl_not_found(self, mock_popen):
         """Test error when journalctl is not installed."""
+        mock_popen.side_effect = FileNotFoundError()
+
         with pytest.raises(APTBridgeError) as exc_info:
             service_journal.execute("test-package")
         assert exc_info.value.code == "JOURNAL_ERROR"
 
 
-class TestStripNonvisualAnsi:
-    """Tests for _strip_nonvisual_ansi helper."""
-
-    def test_strips_erase_line(self):
-        assert service_journal._strip_nonvisual_ansi("\x1b[2Kfoo") == "foo"
-
-    def test_strips_erase_line_no_number(self):
-        assert service_journal._strip_nonvisual_ansi("\x1b[Kfoo") == "foo"
-
-    def test_strips_cursor_up(self):
-        assert service_journal._strip_nonvisual_ansi("\x1b[1Afoo") == "foo"
+class TestSplitLines:
+    """Tests for _split_lines helper."""
+
+    @pytest.mark.parametrize(
+        ("raw_line", "expected"),
+        [
+            pytest.param(b"foo\n", ["foo"], id="newline"),
+            pytest.param(b"foo", ["foo"], id="unterminated"),
+            pytest.param(b"\n", [""], id="empty_line"),
+            pytest.param(b"foo\r\n", ["foo"], id="crlf"),
+            pytest.param(b"50%\r60%\r70%\n", ["50%", "60%", "70%"], id="lone_cr"),
+            pytest.param(b"a\r\rb\n", ["a", "", "b"], id="blank_between_crs"),
+            pytest.param(b"foo\r", ["foo"], id="trailing_cr"),
+        ],
+    )
+    def test_split(self, raw_line, expected):
+        assert service_journal._split_lines(raw_line) == expected
 
-    def test_strips_cursor_movement(self):
-        assert service_journal._strip_nonvisual_ansi("\x1b[5Gfoo") == "foo"
 
-    def test_strips_carriage_return(self):
-        assert service_journal._strip_nonvisual_ansi("foo\rbar") == "foobar"
+class TestStripNonvisualAnsi:
+    """Tests for _strip_nonvisual_ansi helper."""
 
-    def test_preserves_sgr_colors(self):
-        text = "\x1b[32mgreen\x1b[0m"
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            pytest.param(_ERASE_LINE, "foo", id="erase_line"),
+            pytest.param(_ERASE_LINE_NO_NUMBER, "foo", id="erase_line_no_number"),
+            pytest.param(_CURSOR_UP, "foo", id="cursor_up"),
+            pytest.param(_CURSOR_MOVEMENT, "foo", id="cursor_movement"),
+            pytest.param(_CARRIAGE_RETURN, "foobar", id="carriage_return"),
+            pytest.param(_SGR_COLORS, _SGR_COLORS, id="preserves_sgr_colors"),
+            pytest.param(_PLAIN_TEXT, _PLAIN_TEXT, id="no_escape_codes"),
+            pytest.param(_MIXED_CODES, "\x1b[32mgreen\x1b[0m rest", id="mixed_codes"),
+            # Common docker compose pattern: move up + erase to overwrite progress
+            pytest.param(_CURSOR_UP_AND_ERASE, "Done", id="cursor_up_and_erase"),
+        ],
+    )
+    def test_strip(self, text, expected):
+        assert service_journal._strip_nonvisual_ansi(text) == expected
+
+    def test_pattern_is_precompiled(self):
+        assert isinstance(service_journal._NONVISUAL_CSI_RE, re.Pattern)
+
+    def test_large_input_uses_precompiled_pattern(self):
+        """A ~450 KB burst of progress redraws is stripped in one pass, without recompiling."""
+        text = "\x1b[2K\x1b[1Ax" * 50000
+        pattern = Mock(wraps=service_journal._NONVISUAL_CSI_RE)
+
+        # re.sub/re.compile with a string pattern both go through re._compile
+        with (
+            patch.object(service_journal, "_NONVISUAL_CSI_RE", pattern),
+            patch.object(re, "_compile", side_effect=AssertionError("pattern recompiled")),
+        ):
+            assert service_journal._strip_nonvisual_ansi(text) == "x" * 50000
+
+        pattern.sub.assert_called_once()
+
+    def test_large_input_is_allocation_light(self):
+        """Stripping ~1 MB of mixed content allocates little beyond the result."""
+        text = "\x1b[2K" * 250_000 + "x" * 250_000
+
+        tracemalloc.start()
+        try:
+            result = service_journal._strip_nonvisual_ansi(text)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert result == "x" * 250_000
+        assert peak < 4 * len(text)
+
+    def test_unterminated_sequences_are_preserved(self):
+        """Escapes without a final byte never match, so they are left intact."""
+        text = ("\x1b[" + "1;" * 1000) * 100
         assert service_journal._strip_nonvisual_ansi(text) == text
-
-    def test_no_escape_codes(self):
-        assert service_journal._strip_nonvisual_ansi("plain text") == "plain text"
-
-    def test_mixed_codes(self):
-        text = "\x1b[2K\x1b[32mgreen\x1b[0m rest"
-        assert service_journal._strip_nonvisual_ansi(text) == "\x1b[32mgreen\x1b[0m rest"
-
-    def test_cursor_up_and_erase(self):
-        """Common docker compose pattern: move up + erase to overwrite progress."""
-        text = "\x1b[1A\x1b[2KDone"
-        assert service_journal._strip_nonvisual_ansi(text) == "Done"
@@ -0,0 +1,97 @@
+"""
+Unit tests for store filter matching.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from cockpit_container_apps.utils.store_config import StoreConfig, StoreFilter
+from cockpit_container_apps.utils.store_filter import matches_store_filter
+from tests.conftest import MockPackage
+
+STORE_FILTER = "cockpit_container_apps.utils.store_filter"
+
+
+def _origin(origin: str, label: str = "") -> MagicMock:
+    """Create a mock package origin."""
+    mock_origin = MagicMock()
+    mock_origin.origin = origin
+    mock_origin.label = label
+    return mock_origin
+
+
+def _origin_store(origins: list[str]) -> StoreConfig:
+    """Create a store that filters on origins only."""
+    return StoreConfig(
+        id="marine",
+        name="Marine Apps",
+        description="Marine apps",
+        filters=StoreFilter(
+            include_origins=origins,
+            include_sections=[],
+            include_tags=[],
+            include_packages=[],
+        ),
+    )
+
+
+class TestOriginFilter:
+    """Tests for origin matching in matches_store_filter."""
+
+    def test_matches_first_origin(self):
+        pkg = MockPackage("signalk-server-container")
+        pkg.candidate.origins = [_origin("Hat Labs")]
+
+        assert matches_store_filter(pkg, _origin_store(["Hat Labs"]))
+
+    def test_matches_secondary_origin(self):
+        """Test that origins beyond the first one are also checked."""
+        pkg = MockPackage("signalk-server-container")
+        pkg.candidate.origins = [_origin("Debian"), _origin("Hat Labs")]
+
+        assert matches_store_filter(pkg, _origin_store(["Hat Labs"]))
+
+    def test_falls_back_to_label(self):
+        pkg = MockPackage("signalk-server-container")
+        pkg.candidate.origins = [_origin("", label="Hat Labs")]
+
+        assert matches_store_filter(pkg, _origin_store(["Hat Labs"]))
+
+    def test_no_matching_origin(self):
+        pkg = MockPackage("nginx")
+        pkg.candidate.origins = [_origin("Debian")]
+
+        assert not matches_store_filter(pkg, _origin_store(["Hat Labs"]))
+
+    def test_no_candidate(self):
+        pkg = MockPackage("nginx")
+        pkg.candidate = None
+
+        assert not matches_store_filter(pkg, _origin_store(["Hat Labs"]))
+
+
+class TestFilterShortCircuit:
+    """Tests for OR logic between filter types."""
+
+    def test_package_match_skips_apt_lookups(self):
+        """Test that an explicit package match does not read origins or tags."""
+        store = StoreConfig(
+            id="marine",
+            name="Marine Apps",
+            description="Marine apps",
+            filters=StoreFilter(
+                include_origins=["Hat Labs"],
+                include_sections=[],
+                include_tags=["field::marine"],
+                include_packages=["signalk-server-container"],
+            ),
+        )
+        pkg = MockPackage("signalk-server-container")
+
+        with (
+            patch(f"{STORE_FILTER}._matches_origin_filter") as mock_origin,
+            patch(f"{STORE_FILTER}._matches_tags_filter") as mock_tags,
+        ):
+            assert matches_store_filter(pkg, store)
+
+        mock_origin.assert_not_called()
+        mock_tags.assert_not_called()
@@ -0,0 +1,115 @@
+"""
+Unit tests for the debtag cache.
+"""
+
+import gc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cockpit_container_apps.utils import tag_cache
+from cockpit_container_apps.utils.tag_cache import (
+    clear_tag_cache,
+    get_parsed_tags,
+    get_tags_by_facet,
+    has_tag,
+)
+from tests.conftest import MockPackage
+
+
+def _tagged_package(name: str, tags: str) -> MockPackage:
+    pkg = MockPackage(name)
+    pkg.candidate.record["Tag"] = tags
+    return pkg
+
+
+class TestTagCache:
+    """Tests for cached debtag lookups."""
+
+    def test_groups_tags_by_facet(self):
+        """Test that tags are grouped into facet -> values."""
+        pkg = _tagged_package(
+            "signalk", "role::container-app, category::navigation, category::monitoring"
+        )
+
+        parsed = get_parsed_tags(pkg)
+
+        assert parsed["role"] == ("container-app",)
+        assert parsed["category"] == ("navigation", "monitoring")
+
+    def test_parsed_tags_are_read_only(self):
+        """Test that callers cannot modify the cached tags."""
+        pkg = _tagged_package("signalk", "category::navigation")
+
+        with pytest.raises(TypeError):
+            get_parsed_tags(pkg)["category"] = ("monitoring",)
+
+        assert get_tags_by_facet(pkg, "category") == ["navigation"]
+
+    def test_has_tag(self):
+        """Test full tag lookups."""
+        pkg = _tagged_package("signalk", "role::container-app, category::navigation")
+
+        assert has_tag(pkg, "role::container-app")
+        assert has_tag(pkg, "category::navigation")
+        assert not has_tag(pkg, "category::monitoring")
+        assert not has_tag(pkg, "field::marine")
+
+    def test_get_tags_by_facet_keeps_declaration_order(self):
+        """Test that facet values keep their Tag field order."""
+        pkg = _tagged_package("signalk", "category::navigation, category::monitoring")
+
+        assert get_tags_by_facet(pkg, "category") == ["navigation", "monitoring"]
+        assert get_tags_by_facet(pkg, "role") == []
+
+    def test_package_without_tags(self):
+        """Test that packages with no Tag field have no tags."""
+        pkg = MockPackage("plain")
+
+        assert get_parsed_tags(pkg) == {}
+        assert not has_tag(pkg, "role::container-app")
+
+    def test_parses_each_package_once(self):
+        """Test that repeated lookups reuse the parsed tags."""
+        pkg = _tagged_package("signalk", "role::container-app, category::navigation")
+
+        with patch.object(
+            tag_cache, "parse_package_tags", wraps=tag_cache.parse_package_tags
+        ) as mock_parse:
+            has_tag(pkg, "role::container-app")
+            get_tags_by_facet(pkg, "category")
+            has_tag(pkg, "category::navigation")
+
+        assert mock_parse.call_count == 1
+
+    def test_clear_tag_cache(self):
+        """Test that clearing the cache forces a re-parse."""
+        pkg = _tagged_package("signalk", "category::navigation")
+        assert get_tags_by_facet(pkg, "category") == ["navigation"]
+
+        pkg.candidate.record["Tag"] = "category::monitoring"
+        clear_tag_cache()
+
+        assert get_tags_by_facet(pkg, "category") == ["monitoring"]
+
+    def test_entries_do_not_keep_packages_alive(self):
+        """Test that cached tags are dropped together with their package."""
+        pkg = _tagged_package("signalk", "category::navigation")
+        get_tags_by_facet(pkg, "category")
+        assert len(tag_cache._parsed_tags) == 1
+
+        del pkg
+        gc.collect()
+
+        assert len(tag_cache._parsed_tags) == 0
+
+    def test_unhashable_package_is_parsed_uncached(self):
+        """Test that objects that cannot be weakly keyed still work."""
+        pkg = SimpleNamespace(
+            name="signalk",
+            candidate=SimpleNamespace(record={"Tag": "role::container-app"}),
+        )
+
+        assert has_tag(pkg, "role::container-app")
+        assert len(tag_cache._parsed_tags) == 0
@@ -2,36 +2,72 @@
 Unit tests for the update command.
 """
 
-import json
+import os
 import subprocess
-from unittest.mock import MagicMock, patch
+import time
+from types import SimpleNamespace
+from typing import BinaryIO
+from unittest.mock import Mock, patch
 
 import pytest
 
 from cockpit_container_apps.commands import update
 from cockpit_container_apps.vendor.cockpit_apt_utils.errors import APTBridgeError
+from tests._json_stream import iter_ndjson
 
 
+def _popen_mock(stdout: BinaryIO, returncode: int) -> SimpleNamespace:
+    """Create a finished apt-get process stub with the given output and exit status."""
+    return SimpleNamespace(
+        stdout=stdout,
+        returncode=returncode,
+        wait=lambda timeout=None: returncode,
+    )
+
+
+@pytest.fixture
+def pipe_stdout(request):
+    """Factory for real pipes holding given output, as apt-get's stdout would be.
+
+    All output is written before anything reads it, so it must fit in the pipe
+    buffer (typically 64 KiB). Larger inputs fail instead of blocking the test.
+    Streams are closed when the test finishes.
+    """
+
+    def make(lines: list[str]) -> BinaryIO:
+        data = "".join(lines).encode()
+        read_fd, write_fd = os.pipe()
+        stream = os.fdopen(read_fd, "rb")
+        request.addfinalizer(stream.close)
+
+        written = 0
+        try:
+            os.set_blocking(write_fd, False)
+            if data:
+                written = os.write(write_fd, data)
+        except BlockingIOError:
+            pass
+        finally:
+            os.close(write_fd)
+
+        if written != len(data):
+            raise ValueError(f"{len(data)} bytes of output do not fit in the pipe buffer")
+        return stream
+
+    return make
+
+
+@patch("cockpit_container_apps.commands.update.subprocess.Popen", new_callable=Mock)
 class TestUpdate:
     """Tests for update command."""
 
-    @patch("cockpit_container_apps.commands.update.subprocess.Popen")
-    def test_successful_update(self, mock_popen, capsys):
+    def test_successful_update(self, mock_popen, pipe_stdout, capsys):
         """Test successful apt-get update with progress output."""
-        mock_process = MagicMock()
-        mock_process.stdout.__iter__ = MagicMock(
-            return_value=iter(
-                [
-                    "Hit:1 http://deb.debian.org/debian trixie InRelease\n",
-                    "Get:2 http://deb.debian.org/debian trixie-updates InRelease\n",
-                ]
-            )
-        )
-        mock_process.stdout.readline = MagicMock(
-            side_effect=[
+        mock_process = Mock()
+        mock_process.stdout = pipe_stdout(
+            [
                 "Hit:1 http://deb.debian.org/debian trixie InRelease\n",
                 "Get:2 http://deb.debian.org/debian trixie-updates InRelease\n",
-                "",
             ]
         )
         mock_process.returncode = 0
@@ -42,76 +78,52 @@ class TestUpdate:
 
         assert result is None
         captured = capsys.readouterr()
-        lines = [json.loads(line) for line in captured.out.strip().split("\n") if line.strip()]
+        lines = list(iter_ndjson(captured.out))
 
         # Should have progress lines + final progress + final result
         assert any(line.get("type") == "progress" for line in lines)
         assert lines[-1]["success"] is True
 
-    @patch("cockpit_container_apps.commands.update.subprocess.Popen")
-    def test_network_error(self, mock_popen):
-        """Test error handling for network failures."""
-        mock_process = MagicMock()
-        mock_process.stdout.readline = MagicMock(
-            side_effect=[
-                "Err:1 http://deb.debian.org/debian trixie InRelease\n",
-                "  Could not resolve 'deb.debian.org'\n",
-                "",
-            ]
-        )
-        mock_process.returncode = 100
-        mock_process.wait.return_value = 100
-        mock_popen.return_value = mock_process
-
-        with pytest.raises(APTBridgeError) as exc_info:
-            update.execute()
-
-        assert exc_info.value.code == "NETWORK_ERROR"
-
-    @patch("cockpit_container_apps.commands.update.subprocess.Popen")
-    def test_dpkg_interrupted(self, mock_popen):
-        """Test error handling when dpkg is interrupted."""
-        mock_process = MagicMock()
-        mock_process.stdout.readline = MagicMock(
-            side_effect=[
-                "E: dpkg was interrupted\n",
-                "",
-            ]
-        )
-        mock_process.returncode = 100
-        mock_process.wait.return_value = 100
-        mock_popen.return_value = mock_process
-
-        with pytest.raises(APTBridgeError) as exc_info:
-            update.execute()
-
-        assert exc_info.value.code == "LOCKED"
-
-    @patch("cockpit_container_apps.commands.update.subprocess.Popen")
-    def test_generic_failure(self, mock_popen):
-        """Test error handling for generic apt-get update failures."""
-        mock_process = MagicMock()
-        mock_process.stdout.readline = MagicMock(
-            side_effect=[
-                "E: Some unknown error\n",
-                "",
-            ]
-        )
-        mock_process.returncode = 1
-        mock_process.wait.return_value = 1
-        mock_popen.return_value = mock_process
+    @pytest.mark.parametrize(
+        ("lines", "returncode", "expected_code", "expected_detail"),
+        [
+            pytest.param(
+                [
+                    "Err:1 http://deb.debian.org/debian trixie InRelease\n",
+                    "  Could not resolve 'deb.debian.org'\n",
+                ],
+                100,
+                "NETWORK_ERROR",
+                None,
+                id="network_error",
+            ),
+            pytest.param(["E: dpkg was interrupted\n"], 100, "LOCKED", None, id="dpkg_interrupted"),
+            pytest.param(
+                ["E: Some unknown error\n"],
+                1,
+                "UPDATE_FAILED",
+                "Some unknown error",
+                id="generic_failure",
+            ),
+        ],
+    )
+    def test_update_failure(
+        self, mock_popen, pipe_stdout, lines, returncode, expected_code, expected_detail
+    ):
+        """Test that apt-get update failures are mapped to error codes."""
+        mock_popen.return_value = _popen_mock(pipe_stdout(lines), returncode)
 
         with pytest.raises(APTBridgeError) as exc_info:
             update.execute()
 
-        assert exc_info.value.code == "UPDATE_FAILED"
-        assert "Some unknown error" in (exc_info.value.details or "")
+        assert exc_info.value.code == expected_code
+        if expected_detail:
+            assert expected_detail in (exc_info.value.details or "")
 
-    @patch("cockpit_container_apps.commands.update.subprocess.Popen")
-    def test_timeout(self, mock_popen):
+    def test_timeout(self, mock_popen, pipe_stdout):
         """Test that subprocess timeout raises TIMEOUT error."""
-        mock_process = MagicMock()
-        mock_process.stdout.readline = MagicMock(return_value="")
+        mock_process = Mock()
+        mock_process.stdout = pipe_stdout([])
         # First wait() call raises TimeoutExpired; second (after kill) succeeds
         mock_process.wait.side_effect = [
             subprocess.TimeoutExpired(cmd="apt-get update", timeout=300),
@@ -126,17 +138,47 @@ class TestUpdate:
         assert exc_info.value.code == "TIMEOUT"
         mock_process.kill.assert_called_once()
 
-    @patch("cockpit_container_apps.commands.update.subprocess.Popen")
-    def test_progress_percentage_calculation(self, mock_popen, capsys):
+    @patch("cockpit_container_apps.commands.update.HEARTBEAT_INTERVAL_SECONDS", 0.01)
+    @patch("cockpit_container_apps.commands.update.UPDATE_TIMEOUT_SECONDS", 0.1)
+    def test_stalled_output_sends_heartbeats_and_times_out(self, mock_popen, capsys):
+        """Test that a silent apt-get gets heartbeats and is killed at the deadline."""
+        read_fd, write_fd = os.pipe()
+        mock_process = Mock()
+        mock_process.stdout = os.fdopen(read_fd, "rb")
+        mock_process.wait.side_effect = [
+            subprocess.TimeoutExpired(cmd="apt-get update", timeout=0.1),
+            None,
+        ]
+        mock_popen.return_value = mock_process
+
+        try:
+            with pytest.raises(APTBridgeError) as exc_info:
+                update.execute()
+        finally:
+            os.close(write_fd)
+            mock_process.stdout.close()
+
+        assert exc_info.value.code == "TIMEOUT"
+        mock_process.kill.assert_called_once()
+
+        captured = capsys.readouterr()
+        heartbeats = list(iter_ndjson(captured.out))
+        assert heartbeats
+        assert heartbeats[0] == {
+            "type": "progress",
+            "percentage": 0,
+            "message": "Waiting for mirror response...",
+        }
+
+    def test_progress_percentage_calculation(self, mock_popen, pipe_stdout, capsys):
         """Test that progress percentages are calculated correctly."""
-        mock_process = MagicMock()
-        mock_process.stdout.readline = MagicMock(
-            side_effect=[
+        mock_process = Mock()
+        mock_process.stdout = pipe_stdout(
+            [
                 "Hit:1 http://repo1 trixie InRelease\n",
                 "Get:2 http://repo2 trixie InRelease\n",
                 "Hit:3 http://repo3 trixie InRelease\n",
                 "Get:4 http://repo4 trixie InRelease\n",
-                "",
             ]
         )
         mock_process.returncode = 0
@@ -147,15 +189,45 @@ class TestUpdate:
 
         captured = capsys.readouterr()
         progress_lines = [
-            json.loads(line)
-            for line in captured.out.strip().split("\n")
-            if line.strip() and json.loads(line).get("type") == "progress"
+            event for event in iter_ndjson(captured.out) if event.get("type") == "progress"
         ]
 
         # Last progress before final should be 100%
         assert progress_lines[-1]["percentage"] == 100
 
-    @patch("cockpit_container_apps.commands.update.subprocess.Popen")
+    def test_progress_bursts_are_coalesced(self, mock_popen, capsys):
+        """Test that repeated progress is dropped within the interval and sent after it."""
+        mock_process = Mock()
+        mock_process.returncode = 0
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+
+        lines = [
+            "Ign:2 http://repo2 trixie InRelease",  # 0%: first event, sent
+            "Ign:2 http://repo2 trixie InRelease",  # 0% again 10 ms later: dropped
+            "Ign:2 http://repo2 trixie InRelease",  # 0% again 100 ms later: sent
+            "Get:1 http://repo1 trixie InRelease",  # 50%: advances, sent
+        ]
+        # Clock reads: deadline, one per progress line, final wait timeout.
+        # Only update's own time module is replaced, not the process clock.
+        clock = Mock(monotonic=Mock(side_effect=[1000.0, 1000.0, 1000.01, 1000.1, 1000.11, 1000.2]))
+
+        with (
+            patch.object(update, "time", clock),
+            patch.object(update, "_iter_output_lines", return_value=iter(lines)),
+        ):
+            update.execute()
+
+        captured = capsys.readouterr()
+        percentages = [
+            event["percentage"]
+            for event in iter_ndjson(captured.out)
+            if event.get("type") == "progress"
+        ]
+
+        # The final 100% is always sent
+        assert percentages == [0, 0, 50, 100]
+
     def test_unexpected_exception(self, mock_popen):
         """Test that unexpected exceptions are wrapped in APTBridgeError."""
         mock_popen.side_effect = OSError("Permission denied")
@@ -165,3 +237,73 @@ class TestUpdate:
 
         assert exc_info.value.code == "INTERNAL_ERROR"
         assert "Permission denied" in (exc_info.value.details or "")
+
+
+class TestParseProgressLine:
+    """Tests for _parse_progress_line helper."""
+
+    def test_hit_line(self):
+        line = "Hit:1 http://deb.debian.org/debian trixie InRelease"
+        assert update._parse_progress_line(line) == (
+            "Hit",
+            1,
+            "http://deb.debian.org/debian trixie InRelease",
+        )
+
+    def test_get_line_with_size(self):
+        line = "Get:12 http://deb.debian.org/debian trixie-updates InRelease [47.3 kB]"
+        assert update._parse_progress_line(line) == (
+            "Get",
+            12,
+            "http://deb.debian.org/debian trixie-updates InRelease [47.3 kB]",
+        )
+
+    def test_ign_line(self):
+        result = update._parse_progress_line("Ign:3 http://repo trixie InRelease")
+        assert result == ("Ign", 3, "http://repo trixie InRelease")
+
+    def test_error_line_ignored(self):
+        assert update._parse_progress_line("Err:1 http://repo trixie InRelease") is None
+
+    def test_non_progress_line_ignored(self):
+        assert update._parse_progress_line("Reading package lists...") is None
+
+    def test_missing_number_ignored(self):
+        assert update._parse_progress_line("Get: http://repo trixie InRelease") is None
+
+    def test_missing_url_ignored(self):
+        assert update._parse_progress_line("Get:1") is None
+
+
+class TestIterOutputLines:
+    """Tests for _iter_output_lines helper."""
+
+    def test_reads_lines_until_eof(self, pipe_stdout):
+        stream = pipe_stdout(["Hit:1 http://repo1\n", "Get:2 http://repo2\n", "no newline"])
+
+        lines = list(update._iter_output_lines(stream, time.monotonic() + 5))
+
+        assert lines == ["Hit:1 http://repo1", "Get:2 http://repo2", "no newline"]
+
+    @patch("cockpit_container_apps.commands.update.HEARTBEAT_INTERVAL_SECONDS", 0.01)
+    def test_yields_none_while_silent(self):
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(read_fd, "rb") as stream:
+            lines = update._iter_output_lines(stream, time.monotonic() + 5)
+
+            assert next(lines) is None
+
+            os.write(write_fd, b"Hit:1 http://repo1\n")
+            os.close(write_fd)
+
+            assert list(lines) == ["Hit:1 http://repo1"]
+
+    def test_replaces_invalid_utf8(self):
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"bad \xff byte\n")
+        os.close(write_fd)
+
+        with os.fdopen(read_fd, "rb") as stream:
+            lines = list(update._iter_output_lines(stream, time.monotonic() + 5))
+
+        assert lines == ["bad \ufffd byte"]
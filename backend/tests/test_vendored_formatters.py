@@ -11,6 +11,7 @@ from cockpit_container_apps.utils.formatters import (
     format_package,
     format_package_details,
     to_json,
+    write_json_line,
 )
 
 
@@ -31,6 +32,18 @@ class TestToJson:
         assert parsed == [1, 2, 3]
 
 
+class TestWriteJsonLine:
+    """Tests for the write_json_line function."""
+
+    def test_writes_single_compact_line(self, capsys):
+        """Test that data is written as one compact JSON line."""
+        write_json_line({"type": "progress", "percentage": 50})
+
+        captured = capsys.readouterr()
+        assert captured.out == '{"type":"progress","percentage":50}\n'
+        assert json.loads(captured.out) == {"type": "progress", "percentage": 50}
+
+
 class TestFormatPackage:
     """Tests for the format_package function."""
 
@@ -11,9 +11,11 @@ import pytest
 import yaml
 
 from cockpit_container_apps.utils.store_config import (
+    CategoryMetadata,
     StoreConfig,
     StoreFilter,
     load_stores,
+    load_stores_by_id,
 )
 
 
@@ -71,9 +73,25 @@ class TestLoadStores:
             stores = load_stores(Path(tmpdir))
             assert len(stores) == 3
 
+    def test_load_stores_by_id(self):
+        """Test loading store configurations keyed by store ID."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for store_id in ("marine", "casaos"):
+                store_config = {
+                    "id": store_id,
+                    "name": f"{store_id} store",
+                    "description": f"The {store_id} store",
+                    "filters": {
+                        "include_origins": ["Hat Labs"],
+                    },
+                }
+                config_path = Path(tmpdir) / f"{store_id}.yaml"
+                with open(config_path, "w") as f:
+                    yaml.dump(store_config, f)
 
-class TestStoreFilter:
-    """Tests for the StoreFilter class."""
+            stores_by_id = load_stores_by_id(Path(tmpdir))
+            assert sorted(stores_by_id) == ["casaos", "marine"]
+            assert stores_by_id["marine"].name == "marine store"
 
     def test_store_filter_with_origins(self):
         """Test creating a filter with origins."""
@@ -162,3 +180,39 @@ class TestStoreConfig:
                 description="Test",
                 filters=filters,
             )
+
+    def test_category_metadata_by_id(self):
+        """Test category metadata lookup by category ID."""
+        filters = StoreFilter(
+            include_origins=["Hat Labs"],
+            include_sections=[],
+            include_tags=[],
+            include_packages=[],
+        )
+        navigation = CategoryMetadata(id="navigation", label="Navigation & Charts")
+        store = StoreConfig(
+            id="marine-apps",
+            name="Marine Apps",
+            description="Container apps for marine vessels",
+            filters=filters,
+            category_metadata=[navigation],
+        )
+
+        assert store.category_metadata_by_id == {"navigation": navigation}
+
+    def test_category_metadata_by_id_empty(self):
+        """Test category metadata lookup when no metadata is configured."""
+        filters = StoreFilter(
+            include_origins=["Hat Labs"],
+            include_sections=[],
+            include_tags=[],
+            include_packages=[],
+        )
+        store = StoreConfig(
+            id="marine-apps",
+            name="Marine Apps",
+            description="Container apps for marine vessels",
+            filters=filters,
+        )
+
+        assert store.category_metadata_by_id == {}